@@ -5,18 +5,74 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import importlib
+import importlib.machinery
+import importlib.util
 import logging
+import sys
 from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Set
 
 from media_session import MediaSessionReader, TrackInfo
-from rules import RuleSet
 from wallpaper import WallpaperSetter
 
+if TYPE_CHECKING:
+    from rules import RuleSet
+
+# Rapid track skips within this window only apply the last track.
+TRACK_DEBOUNCE_SECONDS = 0.15
+
+
+def load_rules_module() -> ModuleType:
+    """Import ``rules``, preferring a mypyc build unless it is broken or older than rules.py."""
+    source = Path(__file__).with_name("rules.py")
+    spec = importlib.util.find_spec("rules")
+    if spec is None or spec.origin is None or not isinstance(
+        spec.loader, importlib.machinery.ExtensionFileLoader
+    ):
+        return importlib.import_module("rules")
+
+    compiled = Path(spec.origin)
+    if source.stat().st_mtime > compiled.stat().st_mtime:
+        logging.warning(
+            "%s is older than %s; using the pure-Python rules. Rebuild it with mypyc.",
+            compiled.name,
+            source.name,
+        )
+        return _load_source_module("rules", source)
+    try:
+        return importlib.import_module("rules")
+    except ImportError:
+        logging.warning("Compiled rules module failed to import; using %s", source)
+        return _load_source_module("rules", source)
+
+
+def _load_source_module(name: str, source: Path) -> ModuleType:
+    loader = importlib.machinery.SourceFileLoader(name, str(source))
+    spec = importlib.util.spec_from_loader(name, loader)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_ignored_track(track: TrackInfo | None, spotify_only: bool, verbose: bool) -> bool:
+    if track is None or not spotify_only:
+        return False
+    if track.app_id and "spotify" in track.app_id.lower():
+        return False
+    if verbose:
+        logging.info("Ignoring non-Spotify track from %s", track.app_id)
+    return True
+
 
 async def handle_track(
     track: TrackInfo | None,
     rules: RuleSet,
     wallpaper_setter: WallpaperSetter,
+    wallpaper_lock: asyncio.Lock,
     spotify_only: bool,
     verbose: bool,
 ) -> None:
@@ -24,9 +80,7 @@ async def handle_track(
         wallpaper_path = rules.default_wallpaper
         reason = "no active media"
     else:
-        if spotify_only and (not track.app_id or "spotify" not in track.app_id.lower()):
-            if verbose:
-                logging.info("Ignoring non-Spotify track from %s", track.app_id)
+        if is_ignored_track(track, spotify_only, verbose):
             return
         wallpaper_path = rules.match(track)
         reason = f"track: {track.title} — {track.artist} ({track.album})"
@@ -35,7 +89,9 @@ async def handle_track(
         logging.warning("No wallpaper selected (%s)", reason)
         return
 
-    changed = wallpaper_setter.set_wallpaper(wallpaper_path)
+    # SystemParametersInfoW can block for a while; keep the event loop free for GSMTC events.
+    async with wallpaper_lock:
+        changed = await asyncio.to_thread(wallpaper_setter.set_wallpaper, wallpaper_path)
     if changed:
         logging.info("Wallpaper updated to %s (%s)", wallpaper_path, reason)
     elif verbose:
@@ -43,14 +99,53 @@ async def handle_track(
 
 
 async def run(args: argparse.Namespace) -> None:
-    rules = RuleSet.load(Path("config/rules.json"))
+    rules = load_rules_module().RuleSet.load(Path("config/rules.json"))
     wallpaper_setter = WallpaperSetter()
-
-    async def on_track_change(track: TrackInfo | None) -> None:
-        await handle_track(track, rules, wallpaper_setter, args.spotify_only, args.verbose)
+    wallpaper_lock = asyncio.Lock()
+    # Only pending_task may be cancelled; update_tasks keeps every task alive until done.
+    pending_task: asyncio.Task | None = None
+    update_tasks: Set[asyncio.Task] = set()
+
+    async def apply_track(track: TrackInfo | None) -> None:
+        nonlocal pending_task
+        await asyncio.sleep(TRACK_DEBOUNCE_SECONDS)
+        # Past the debounce window: a newer track must not cancel us mid-update.
+        pending_task = None
+        try:
+            await handle_track(
+                track, rules, wallpaper_setter, wallpaper_lock, args.spotify_only, args.verbose
+            )
+        except Exception:
+            logging.exception("Error handling track change")
+
+    def on_track_change(track: TrackInfo | None) -> None:
+        nonlocal pending_task
+        # Filter first so an ignored track never cancels a pending update.
+        if is_ignored_track(track, args.spotify_only, args.verbose):
+            return
+        if pending_task is not None:
+            pending_task.cancel()
+        pending_task = asyncio.create_task(apply_track(track))
+        update_tasks.add(pending_task)
+        pending_task.add_done_callback(update_tasks.discard)
+
+    def log_track(track: TrackInfo | None) -> None:
+        if track is None:
+            logging.debug("Media session: no active media")
+        else:
+            logging.debug(
+                "Media session: %s — %s (%s) from %s, playing=%s",
+                track.title,
+                track.artist,
+                track.album,
+                track.app_id,
+                track.is_playing,
+            )
 
     reader = MediaSessionReader(polling_interval=args.polling_interval)
     reader.subscribe(on_track_change)
+    if args.verbose:
+        reader.subscribe(log_track)
 
     await reader.start()
     try:
@@ -69,8 +164,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--polling-interval",
         type=float,
-        default=1.0,
-        help="Polling fallback interval in seconds (default: 1.0).",
+        default=30.0,
+        help="Polling fallback interval in seconds (default: 30.0).",
     )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging.")
     return parser.parse_args()
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
 import time
-from dataclasses import dataclass
-from typing import Awaitable, Callable, List
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Coroutine, List, Set
 
 import winrt.windows.media.control as wmc
 
@@ -19,32 +20,81 @@ class TrackInfo:
     app_id: str
     is_playing: bool
     timestamp: float
+    _identity: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Built once so repeated comparisons and cache keys reuse the same tuple.
+        object.__setattr__(
+            self, "_identity", (self.title, self.artist, self.album, self.app_id, self.is_playing)
+        )
 
     @property
     def identity(self) -> tuple:
-        return (self.title, self.artist, self.album, self.app_id, self.is_playing)
+        return self._identity
+
+
+TrackCallback = Callable[[TrackInfo | None], Awaitable[None] | None]
+
+
+def _track_from_identity(identity: tuple) -> TrackInfo:
+    title, artist, album, app_id, is_playing = identity
+    return TrackInfo(
+        title=title,
+        artist=artist,
+        album=album,
+        app_id=app_id,
+        is_playing=is_playing,
+        timestamp=time.time(),
+    )
+
+
+# Bursts of GSMTC events within this window collapse into a single poll.
+EVENT_DEBOUNCE_SECONDS = 0.05
 
 
 class MediaSessionReader:
-    def __init__(self, polling_interval: float = 1.0) -> None:
+    def __init__(self, polling_interval: float = 30.0) -> None:
+        # Track changes arrive through WinRT events; polling is only a sanity check.
         self._polling_interval = max(0.2, polling_interval)
-        self._callbacks: List[Callable[[TrackInfo | None], Awaitable[None]]] = []
+        self._sync_callbacks: List[TrackCallback] = []
+        self._async_callbacks: List[Callable[[TrackInfo | None], Awaitable[None]]] = []
         self._manager: wmc.GlobalSystemMediaTransportControlsSessionManager | None = None
         self._session: wmc.GlobalSystemMediaTransportControlsSession | None = None
         self._running = False
         self._last_identity: tuple | None = None
-        self._lock = asyncio.Lock()
-
-    def subscribe(self, callback: Callable[[TrackInfo | None], Awaitable[None]]) -> None:
-        self._callbacks.append(callback)
+        # Generation counters: a request that arrives mid-run makes the runner go again
+        # once, instead of queueing one redundant run per request.
+        self._update_gen = 0
+        self._update_running = False
+        self._poll_gen = 0
+        self._poll_running = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._poll_handle: asyncio.TimerHandle | None = None
+        # Strong references so event-driven tasks are not garbage-collected mid-run.
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    def subscribe(self, callback: TrackCallback) -> None:
+        """Register a plain function or coroutine function to receive track changes."""
+        if inspect.iscoroutinefunction(callback):
+            self._async_callbacks.append(callback)
+        else:
+            self._sync_callbacks.append(callback)
 
     async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
         self._manager = await wmc.GlobalSystemMediaTransportControlsSessionManager.request_async()
         self._manager.sessions_changed += self._on_sessions_changed
         await self._update_session()
 
     async def stop(self) -> None:
         self._running = False
+        # Late WinRT events must not reach a loop that may already be closed.
+        self._loop = None
+        if self._poll_handle is not None:
+            self._poll_handle.cancel()
+            self._poll_handle = None
+        if self._manager is not None:
+            self._manager.sessions_changed -= self._on_sessions_changed
         if self._session is not None:
             self._session.media_properties_changed -= self._on_media_properties_changed
             self._session.playback_info_changed -= self._on_playback_info_changed
@@ -56,14 +106,21 @@ class MediaSessionReader:
             await asyncio.sleep(self._polling_interval)
 
     async def get_current_track(self) -> TrackInfo | None:
-        if self._session is None:
+        identity = await self._read_identity()
+        return _track_from_identity(identity) if identity else None
+
+    async def _read_identity(self) -> tuple | None:
+        """Return the raw ``TrackInfo.identity`` tuple without building a TrackInfo."""
+        # The session can be swapped while we await; read everything from one snapshot.
+        session = self._session
+        if session is None:
             return None
 
-        media_props = await self._session.try_get_media_properties_async()
+        media_props = await session.try_get_media_properties_async()
         if not media_props:
             return None
 
-        playback_info = self._session.get_playback_info()
+        playback_info = session.get_playback_info()
         is_playing = (
             playback_info is not None
             and playback_info.playback_status
@@ -73,55 +130,113 @@ class MediaSessionReader:
         title = (media_props.title or "").strip()
         artist = (media_props.artist or "").strip()
         album = (media_props.album_title or "").strip()
-        app_id = (self._session.source_app_user_model_id or "").strip()
+        app_id = (session.source_app_user_model_id or "").strip()
 
-        if not any([title, artist, album]):
+        if not (title or artist or album):
             return None
 
-        return TrackInfo(
-            title=title,
-            artist=artist,
-            album=album,
-            app_id=app_id,
-            is_playing=is_playing,
-            timestamp=time.time(),
-        )
+        return (title, artist, album, app_id, is_playing)
 
     async def _poll_once(self) -> None:
-        track = await self.get_current_track()
-        identity = track.identity if track else None
-        if identity != self._last_identity:
-            self._last_identity = identity
-            await self._emit(track)
+        self._poll_gen += 1
+        if self._poll_running:
+            return
+        self._poll_running = True
+        try:
+            seen_gen = None
+            while seen_gen != self._poll_gen:
+                seen_gen = self._poll_gen
+                # Compare raw identities first so unchanged polls allocate no TrackInfo.
+                identity = await self._read_identity()
+                if identity != self._last_identity:
+                    self._last_identity = identity
+                    await self._emit(_track_from_identity(identity) if identity else None)
+        finally:
+            self._poll_running = False
 
     async def _emit(self, track: TrackInfo | None) -> None:
-        for callback in self._callbacks:
+        # Sync subscribers run inline; only awaitables go through gather. A callable that
+        # is not a coroutine function may still return one (lambda, partial, async __call__).
+        awaitables: List[Awaitable[None]] = []
+        for callback in self._sync_callbacks:
             try:
-                await callback(track)
+                returned = callback(track)
             except Exception:
                 logging.exception("Error in track change callback")
+                continue
+            if inspect.isawaitable(returned):
+                awaitables.append(returned)
+        awaitables.extend(callback(track) for callback in self._async_callbacks)
+        if not awaitables:
+            return
+        results = await asyncio.gather(*awaitables, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error("Error in track change callback", exc_info=result)
 
     async def _update_session(self) -> None:
-        async with self._lock:
-            if self._manager is None:
-                return
-            session = self._manager.get_current_session()
-            if session == self._session:
-                return
-            if self._session is not None:
-                self._session.media_properties_changed -= self._on_media_properties_changed
-                self._session.playback_info_changed -= self._on_playback_info_changed
-            self._session = session
-            if self._session is not None:
-                self._session.media_properties_changed += self._on_media_properties_changed
-                self._session.playback_info_changed += self._on_playback_info_changed
-            await self._poll_once()
+        self._update_gen += 1
+        if self._update_running:
+            return
+        self._update_running = True
+        try:
+            seen_gen = None
+            while seen_gen != self._update_gen:
+                seen_gen = self._update_gen
+                await self._swap_session()
+        finally:
+            self._update_running = False
+
+    async def _swap_session(self) -> None:
+        if self._manager is None:
+            return
+        session = self._manager.get_current_session()
+        if session == self._session:
+            return
+        if self._session is not None:
+            self._session.media_properties_changed -= self._on_media_properties_changed
+            self._session.playback_info_changed -= self._on_playback_info_changed
+        self._session = session
+        if self._session is not None:
+            self._session.media_properties_changed += self._on_media_properties_changed
+            self._session.playback_info_changed += self._on_playback_info_changed
+        await self._poll_once()
+
+    def _schedule_poll(self) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        if self._poll_handle is not None:
+            self._poll_handle.cancel()
+        self._poll_handle = loop.call_later(EVENT_DEBOUNCE_SECONDS, self._start_poll)
+
+    def _start_poll(self) -> None:
+        self._poll_handle = None
+        self._spawn(self._poll_once())
+
+    def _start_update_session(self) -> None:
+        self._spawn(self._update_session())
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _call_on_loop(self, callback: Callable[[], None]) -> None:
+        # WinRT raises events on a worker thread, so hop back onto the event loop.
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            pass  # Loop closed between stop() and this event.
 
     def _on_sessions_changed(self, _sender, _args) -> None:
-        asyncio.create_task(self._update_session())
+        self._call_on_loop(self._start_update_session)
 
     def _on_media_properties_changed(self, _sender, _args) -> None:
-        asyncio.create_task(self._poll_once())
+        self._call_on_loop(self._schedule_poll)
 
     def _on_playback_info_changed(self, _sender, _args) -> None:
-        asyncio.create_task(self._poll_once())
+        self._call_on_loop(self._schedule_poll)
@@ -2,14 +2,41 @@
 
 from __future__ import annotations
 
+import heapq
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from media_session import TrackInfo
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+# Below this many rules a linear scan is cheaper than walking the automatons.
+INDEX_MIN_RULES = 8
+
+
+_Check = Tuple[Callable[[TrackInfo], str], re.Pattern[str]]
+_Lowered = Tuple[str, str, str, str]
+
+# (getter, substring key, regex key) for each track field a rule can test.
+_FIELDS: Tuple[Tuple[Callable[[TrackInfo], str], str, Optional[str]], ...] = (
+    (attrgetter("artist"), "artist_contains", "artist_regex"),
+    (attrgetter("title"), "title_contains", "title_regex"),
+    (attrgetter("album"), "album_contains", "album_regex"),
+    (attrgetter("app_id"), "app_id_contains", None),
+)
+
+
+def _lower_fields(track: TrackInfo) -> _Lowered:
+    """Lowercase the track fields in ``_FIELDS`` order, once per match pass."""
+    return (track.artist.lower(), track.title.lower(), track.album.lower(), track.app_id.lower())
+
 
 @dataclass(frozen=True)
 class Rule:
@@ -22,29 +49,91 @@ class Rule:
     album_regex: Optional[str] = None
     app_id_contains: Optional[str] = None
     priority: int = 0
+    _needles: Tuple[Tuple[int, str], ...] = field(init=False, repr=False, compare=False)
+    _checks: Tuple[_Check, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Lowercase needles and compile patterns once; matches() runs on every track change.
+        needles: List[Tuple[int, str]] = []
+        checks: List[_Check] = []
+        for field_index, (getter, contains_key, regex_key) in enumerate(_FIELDS):
+            needle = getattr(self, contains_key)
+            if needle:
+                needles.append((field_index, needle.lower()))
+            pattern = getattr(self, regex_key) if regex_key else None
+            if pattern:
+                checks.append((getter, re.compile(pattern, re.IGNORECASE)))
+        object.__setattr__(self, "_needles", tuple(needles))
+        object.__setattr__(self, "_checks", tuple(checks))
 
-    def matches(self, track: TrackInfo) -> bool:
-        if self.artist_contains and self.artist_contains.lower() not in track.artist.lower():
-            return False
-        if self.title_contains and self.title_contains.lower() not in track.title.lower():
-            return False
-        if self.album_contains and self.album_contains.lower() not in track.album.lower():
-            return False
-        if self.app_id_contains and self.app_id_contains.lower() not in track.app_id.lower():
-            return False
-        if self.title_regex and not re.search(self.title_regex, track.title, re.IGNORECASE):
-            return False
-        if self.artist_regex and not re.search(self.artist_regex, track.artist, re.IGNORECASE):
-            return False
-        if self.album_regex and not re.search(self.album_regex, track.album, re.IGNORECASE):
-            return False
-        return True
+    def matches(self, track: TrackInfo, lowered: Optional[_Lowered] = None) -> bool:
+        if self._needles:
+            if lowered is None:
+                lowered = _lower_fields(track)
+            for field_index, needle in self._needles:
+                if needle not in lowered[field_index]:
+                    return False
+        return self.matches_patterns(track)
+
+    def matches_patterns(self, track: TrackInfo) -> bool:
+        """Check only the ``*_regex`` conditions, for callers that verified the needles."""
+        return all(pattern.search(getter(track)) for getter, pattern in self._checks)
+
+
+class _NeedleIndex:
+    """Aho-Corasick automatons over every rule's ``*_contains`` needles.
+
+    One scan per track field yields the rules whose substring conditions all hit;
+    those candidates only need Rule.matches_patterns for their regex conditions.
+    """
+
+    def __init__(self, rules: List[Rule]) -> None:
+        self._automatons: List[Tuple[int, int, Any]] = []
+        self._required: List[int] = [0] * len(rules)
+        for field_index, (_getter, contains_key, _regex_key) in enumerate(_FIELDS):
+            bit = 1 << field_index
+            rules_by_needle: Dict[str, List[int]] = {}
+            for rule_index, rule in enumerate(rules):
+                needle = getattr(rule, contains_key)
+                if needle:
+                    rules_by_needle.setdefault(needle.lower(), []).append(rule_index)
+                    self._required[rule_index] |= bit
+            if not rules_by_needle:
+                continue
+            automaton = ahocorasick.Automaton()
+            for needle, rule_indexes in rules_by_needle.items():
+                automaton.add_word(needle, tuple(rule_indexes))
+            automaton.make_automaton()
+            self._automatons.append((field_index, bit, automaton))
+        # Rules without needles are always candidates.
+        self._unindexed: List[int] = [
+            rule_index for rule_index, required in enumerate(self._required) if not required
+        ]
+
+    def candidates(self, lowered: _Lowered) -> Iterator[int]:
+        """Lazily yield indexes of rules whose substring conditions all match, in rule order."""
+        hits: Dict[int, int] = {}
+        for field_index, bit, automaton in self._automatons:
+            for _end, rule_indexes in automaton.iter(lowered[field_index]):
+                for rule_index in rule_indexes:
+                    hits[rule_index] = hits.get(rule_index, 0) | bit
+        satisfied = sorted(
+            rule_index for rule_index, mask in hits.items() if mask == self._required[rule_index]
+        )
+        return heapq.merge(satisfied, self._unindexed)
 
 
 @dataclass(frozen=True)
 class RuleSet:
     default_wallpaper: Optional[Path]
     rules: List[Rule]
+    _index: Optional[_NeedleIndex] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        index = None
+        if ahocorasick is not None and len(self.rules) >= INDEX_MIN_RULES:
+            index = _NeedleIndex(self.rules)
+        object.__setattr__(self, "_index", index)
 
     @classmethod
     def load(cls, path: Path) -> "RuleSet":
@@ -74,8 +163,16 @@ class RuleSet:
         return cls(default_wallpaper=default_path, rules=rules)
 
     def match(self, track: TrackInfo) -> Optional[Path]:
+        lowered = _lower_fields(track)
+        if self._index is not None:
+            for rule_index in self._index.candidates(lowered):
+                rule = self.rules[rule_index]
+                if rule.matches_patterns(track):
+                    return rule.wallpaper
+            return self.default_wallpaper
+
         for rule in self.rules:
-            if rule.matches(track):
+            if rule.matches(track, lowered):
                 return rule.wallpaper
         return self.default_wallpaper
 
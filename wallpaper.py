@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import ctypes
+import json
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 try:
     from PIL import Image
@@ -18,26 +20,47 @@ SPIF_SENDCHANGE = 0x02
 
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".bmp", ".png"}
 
+DEFAULT_PNG_INDEX = Path(".generated/png_bmp_index.json")
+
 
 class WallpaperSetter:
-    def __init__(self) -> None:
+    def __init__(self, png_index_path: Path = DEFAULT_PNG_INDEX) -> None:
         self._current_wallpaper: Optional[Path] = None
+        self._current_signature: Optional[Tuple[int, int]] = None
+        # Input path -> resolved path that passed the format check.
+        self._resolved_paths: Dict[str | Path, Path] = {}
+        self._png_index_path = png_index_path
+        # Source PNG -> (mtime_ns, size, converted BMP), persisted across restarts.
+        self._png_index: Dict[str, Tuple[int, int, str]] = self._load_png_index()
 
     def set_wallpaper(self, path: str | Path) -> bool:
-        image_path = Path(path).expanduser().resolve()
-        if not image_path.exists():
+        # resolve() stats every path component; only pay for it once per input path.
+        image_path = self._resolved_paths.get(path)
+        verified = image_path is not None
+        if image_path is None:
+            image_path = Path(path).expanduser().resolve()
+
+        try:
+            stat = image_path.stat()
+        except OSError:
+            self._resolved_paths.pop(path, None)
             logging.warning("Wallpaper file does not exist: %s", image_path)
             return False
 
-        if image_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            logging.warning("Unsupported wallpaper format: %s", image_path.suffix)
-            return False
+        if not verified:
+            if image_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                logging.warning("Unsupported wallpaper format: %s", image_path.suffix)
+                return False
+            self._resolved_paths[path] = image_path
 
-        if self._current_wallpaper == image_path:
+        # Skip the SPI_SETDESKWALLPAPER broadcast unless the file itself changed.
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._current_wallpaper == image_path and self._current_signature == signature:
             return False
+        source_path = image_path
 
         if image_path.suffix.lower() == ".png":
-            image_path = self._ensure_png_compatible(image_path)
+            image_path = self._ensure_png_compatible(image_path, signature)
 
         result = ctypes.windll.user32.SystemParametersInfoW(
             SPI_SETDESKWALLPAPER,
@@ -48,10 +71,17 @@ class WallpaperSetter:
         if not result:
             raise ctypes.WinError()
 
-        self._current_wallpaper = image_path
+        self._current_wallpaper = source_path
+        self._current_signature = signature
         return True
 
-    def _ensure_png_compatible(self, image_path: Path) -> Path:
+    def _ensure_png_compatible(self, image_path: Path, signature: Tuple[int, int]) -> Path:
+        entry = self._png_index.get(str(image_path))
+        if entry is not None and (entry[0], entry[1]) == signature:
+            bmp_path = Path(entry[2])
+            if bmp_path.exists():
+                return bmp_path
+
         if Image is None:
             logging.warning(
                 "Pillow not installed; PNG support may be limited. "
@@ -60,14 +90,40 @@ class WallpaperSetter:
             return image_path
 
         bmp_path = image_path.with_suffix(".bmp")
-        if bmp_path.exists():
-            return bmp_path
-
+        # Write to a sibling file and swap it in so Windows never reads a partial BMP.
+        tmp_path = bmp_path.with_suffix(".bmp.tmp")
         try:
             with Image.open(image_path) as img:
-                img.save(bmp_path, format="BMP")
+                img.save(tmp_path, format="BMP")
+            os.replace(tmp_path, bmp_path)
             logging.info("Converted %s to %s for wallpaper compatibility.", image_path, bmp_path)
-            return bmp_path
         except Exception:
+            tmp_path.unlink(missing_ok=True)
             logging.exception("Failed to convert PNG to BMP; using original PNG.")
             return image_path
+
+        self._png_index[str(image_path)] = (signature[0], signature[1], str(bmp_path))
+        self._save_png_index()
+        return bmp_path
+
+    def _load_png_index(self) -> Dict[str, Tuple[int, int, str]]:
+        try:
+            payload = json.loads(self._png_index_path.read_text())
+            return {
+                str(src): (int(mtime), int(size), str(bmp))
+                for src, (mtime, size, bmp) in payload.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (OSError, TypeError, ValueError, AttributeError):
+            logging.warning("Ignoring unreadable PNG index: %s", self._png_index_path)
+            return {}
+
+    def _save_png_index(self) -> None:
+        tmp_path = self._png_index_path.with_suffix(".json.tmp")
+        try:
+            self._png_index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(self._png_index, indent=2))
+            os.replace(tmp_path, self._png_index_path)
+        except OSError:
+            logging.exception("Failed to write PNG index %s", self._png_index_path)